@@ -5,8 +5,411 @@ Date: [2025-03-19]
 """
 
 # Imports
+import math
+
 import numpy as np
 import pandas as pd
 
 # Functions
 
+def _as_f64(value):
+    """
+    Return value as float64: Python numbers and float64 values pass through,
+    other NumPy scalars become np.float64 and everything else a C-contiguous
+    float64 array (0-d arrays stay 0-d).
+
+    The array branches coerce their inputs with this once, so every ufunc
+    after it runs its unit-stride float64 inner loop.
+    """
+    if isinstance(value, np.ndarray):
+        if value.dtype == np.float64 and value.flags.c_contiguous:
+            return value
+    elif isinstance(value, (int, float)):
+        return value
+    elif isinstance(value, np.generic):
+        return np.float64(value)
+    return np.asarray(value, dtype=np.float64, order='C')
+
+def factor_to_forward(factors):
+    """
+    Convert a curve of discount factors into one-period forward factors.
+
+    The forward factor at position i is factors[i+1] / factors[i]; the last
+    position has no following tenor and is set to NaN so the result stays a
+    float64 array. A 2-D input of shape (n_curves, n_tenors) is treated as a
+    batch of curves, one per row.
+    """
+    factors = np.ascontiguousarray(factors, dtype=np.float64)
+    fwd = np.empty_like(factors)
+    if factors.size == 0:
+        return fwd
+    np.divide(factors[..., 1:], factors[..., :-1], out=fwd[..., :-1])
+    fwd[..., -1] = np.nan
+    return fwd
+
+def factor_to_forward_log(log_factors):
+    """
+    Convert a curve of log discount factors into log forward factors.
+
+    Equivalent to log(factor_to_forward(exp(log_factors))) but only takes the
+    difference of neighbouring values, so callers already holding log
+    factors (e.g. -r * t for continuous rates) skip an exp/log round trip.
+    Batches of curves are handled row-wise as in factor_to_forward.
+    """
+    log_factors = np.ascontiguousarray(log_factors, dtype=np.float64)
+    fwd = np.empty_like(log_factors)
+    if log_factors.size == 0:
+        return fwd
+    np.subtract(log_factors[..., 1:], log_factors[..., :-1], out=fwd[..., :-1])
+    fwd[..., -1] = np.nan
+    return fwd
+
+# Python numbers (NumPy float64 included) take a math-module path that skips
+# ufunc dispatch. When math raises where NumPy would return inf or nan, the
+# value is retried as np.float64 so scalars and arrays give the same IEEE
+# results and warnings.
+_NUMBERS = (int, float)
+
+# Below this many elements the extra in-place ufunc calls cost more than the
+# temporaries they save (measured ~0.3 us slower at 20-1000 elements, ~3x
+# faster from 100k).
+_BUFFER_MIN_SIZE = 10_000
+
+def _new_buffer(a, b):
+    """
+    Uninitialised float64 buffer for an element-wise result of a and b, or
+    None when the array operand is small or the result would need
+    broadcasting beyond it.
+    """
+    if isinstance(a, np.ndarray):
+        if a.size >= _BUFFER_MIN_SIZE and (not isinstance(b, np.ndarray)
+                                           or b.shape == a.shape):
+            return np.empty_like(a, dtype=np.float64)
+        return None
+    if isinstance(b, np.ndarray) and b.size >= _BUFFER_MIN_SIZE:
+        return np.empty_like(b, dtype=np.float64)
+    return None
+
+def _own_buffer(a, b):
+    """a itself when it is a large array that can hold the result of a and b."""
+    if (isinstance(a, np.ndarray) and a.size >= _BUFFER_MIN_SIZE
+            and (not isinstance(b, np.ndarray) or b.shape == a.shape)):
+        return a
+    return None
+
+def _specialize(table, discrete, compounding_freq):
+    """
+    Resolve a compounding_freq missing from table: a positive number of
+    periods per year maps to the discrete implementation, which is cached in
+    table so later calls with it cost a single dict lookup.
+    """
+    if (isinstance(compounding_freq, (int, float, np.number))
+            and not isinstance(compounding_freq, bool) and compounding_freq > 0):
+        table[compounding_freq] = discrete
+        return discrete
+    raise ValueError("compounding_freq must be 'continuous' or a positive "
+                     f"number of periods per year, got {compounding_freq!r}")
+
+# The rate/factor formulas live in the log domain only: the public converters
+# below add a single exp or log around these, and rate_factor_converter uses
+# them directly. Large same-shaped array inputs are computed in one buffer;
+# everything else uses the plain expression, which is as fast at curve sizes.
+# The log-to-rate helpers overwrite their log_factor argument when it is an
+# array of the result's shape, so callers pass them a value they own.
+
+def _rate_to_log_factor_continuous(discount_rate, ttm, compounding_freq=None):
+    """Log discount factors -r * t of continuously compounded rates."""
+    if isinstance(discount_rate, _NUMBERS) and isinstance(ttm, _NUMBERS):
+        return -(discount_rate * ttm)
+    discount_rate, ttm = _as_f64(discount_rate), _as_f64(ttm)
+    out = _new_buffer(discount_rate, ttm)
+    if out is None:
+        return -(discount_rate * ttm)
+    np.multiply(discount_rate, ttm, out=out)
+    np.negative(out, out=out)
+    return out[()]
+
+def _rate_to_log_factor_discrete(discount_rate, ttm, compounding_freq):
+    """
+    Log discount factors -cf * t * log1p(r / cf) of discretely compounded
+    rates. log1p keeps full precision for rates close to zero, where forming
+    1 + r / cf would round r away.
+    """
+    if isinstance(discount_rate, _NUMBERS) and isinstance(ttm, _NUMBERS):
+        try:
+            return (-compounding_freq * ttm
+                    * math.log1p(discount_rate / compounding_freq))
+        except (ArithmeticError, ValueError):
+            discount_rate = np.float64(discount_rate)
+    discount_rate, ttm = _as_f64(discount_rate), _as_f64(ttm)
+    out = _new_buffer(discount_rate, ttm)
+    if out is None:
+        return -compounding_freq * ttm * np.log1p(discount_rate / compounding_freq)
+    np.divide(discount_rate, compounding_freq, out=out)
+    np.log1p(out, out=out)
+    out *= ttm
+    out *= -compounding_freq
+    return out[()]
+
+def _log_factor_to_rate_continuous(log_factor, ttm, compounding_freq=None):
+    """Continuously compounded rates -log(df) / t from log discount factors."""
+    if isinstance(log_factor, _NUMBERS) and isinstance(ttm, _NUMBERS):
+        try:
+            return -log_factor / ttm
+        except ArithmeticError:
+            log_factor = np.float64(log_factor)
+    ttm = _as_f64(ttm)
+    out = _own_buffer(log_factor, ttm)
+    if out is None:
+        return -log_factor / ttm
+    out /= ttm
+    np.negative(out, out=out)
+    return out[()]
+
+def _log_factor_to_rate_discrete(log_factor, ttm, compounding_freq):
+    """
+    Discretely compounded rates cf * expm1(-log(df) / (cf * t)) from log
+    discount factors, the stable inverse of _rate_to_log_factor_discrete.
+    """
+    if isinstance(log_factor, _NUMBERS) and isinstance(ttm, _NUMBERS):
+        try:
+            return (math.expm1(-log_factor / (compounding_freq * ttm))
+                    * compounding_freq)
+        except ArithmeticError:
+            log_factor = np.float64(log_factor)
+    ttm = _as_f64(ttm)
+    out = _own_buffer(log_factor, ttm)
+    if out is None:
+        return np.expm1(-log_factor / (compounding_freq * ttm)) * compounding_freq
+    out /= ttm
+    out /= -compounding_freq
+    np.expm1(out, out=out)
+    out *= compounding_freq
+    return out[()]
+
+_RATE_TO_LOG_FACTOR = {'continuous': _rate_to_log_factor_continuous}
+_LOG_FACTOR_TO_RATE = {'continuous': _log_factor_to_rate_continuous}
+
+def _rate_to_log_factor(discount_rate, ttm, compounding_freq):
+    """Convert discount rates into log discount factors."""
+    func = _RATE_TO_LOG_FACTOR.get(compounding_freq)
+    if func is None:
+        func = _specialize(_RATE_TO_LOG_FACTOR, _rate_to_log_factor_discrete,
+                           compounding_freq)
+    return func(discount_rate, ttm, compounding_freq)
+
+def _log_factor_to_rate(log_factor, ttm, compounding_freq):
+    """Convert log discount factors into discount rates."""
+    func = _LOG_FACTOR_TO_RATE.get(compounding_freq)
+    if func is None:
+        func = _specialize(_LOG_FACTOR_TO_RATE, _log_factor_to_rate_discrete,
+                           compounding_freq)
+    return func(log_factor, ttm, compounding_freq)
+
+def _exp(log_factor):
+    """exp of a freshly computed log factor, reusing its buffer for arrays."""
+    if isinstance(log_factor, np.ndarray):
+        return np.exp(log_factor, out=log_factor)
+    if isinstance(log_factor, _NUMBERS):
+        try:
+            return math.exp(log_factor)
+        except OverflowError:
+            log_factor = np.float64(log_factor)
+    return np.exp(log_factor)
+
+def _log(factor):
+    """log of a discount factor, as a new value."""
+    if isinstance(factor, _NUMBERS):
+        try:
+            return math.log(factor)
+        except ValueError:
+            factor = np.float64(factor)
+    return np.log(_as_f64(factor))
+
+def rate_to_factor_continuous(discount_rate, ttm, compounding_freq=None):
+    """
+    Convert continuously compounded discount rates into discount factors.
+
+    compounding_freq is accepted so the signature matches rate_to_factor and
+    is ignored.
+    """
+    return _exp(_rate_to_log_factor_continuous(discount_rate, ttm))
+
+def rate_to_factor_discrete(discount_rate, ttm, compounding_freq):
+    """
+    Convert discount rates compounded compounding_freq times a year into
+    discount factors.
+
+    Evaluated as exp(-cf * t * log1p(r / cf)), which keeps full precision for
+    rates close to zero where forming 1 + r / cf would round r away.
+    """
+    return _exp(_rate_to_log_factor_discrete(discount_rate, ttm, compounding_freq))
+
+_RATE_TO_FACTOR = {'continuous': rate_to_factor_continuous}
+
+def rate_to_factor(discount_rate, ttm, compounding_freq):
+    """
+    Convert discount rates into discount factors.
+
+    compounding_freq is either the number of compounding periods per year or
+    'continuous'. Callers that know the compounding mode can call
+    rate_to_factor_continuous or rate_to_factor_discrete directly.
+    """
+    func = _RATE_TO_FACTOR.get(compounding_freq)
+    if func is None:
+        func = _specialize(_RATE_TO_FACTOR, rate_to_factor_discrete,
+                           compounding_freq)
+    return func(discount_rate, ttm, compounding_freq)
+
+def factor_to_rate_continuous(discount_factor, ttm, compounding_freq=None):
+    """
+    Convert discount factors into continuously compounded discount rates.
+
+    compounding_freq is accepted so the signature matches factor_to_rate and
+    is ignored.
+    """
+    return _log_factor_to_rate_continuous(_log(discount_factor), ttm)
+
+def factor_to_rate_discrete(discount_factor, ttm, compounding_freq):
+    """
+    Convert discount factors into discount rates compounded compounding_freq
+    times a year.
+
+    Evaluated as cf * expm1(-log(df) / (cf * t)), the stable counterpart of
+    rate_to_factor_discrete.
+    """
+    return _log_factor_to_rate_discrete(_log(discount_factor), ttm,
+                                        compounding_freq)
+
+_FACTOR_TO_RATE = {'continuous': factor_to_rate_continuous}
+
+def factor_to_rate(discount_factor, ttm, compounding_freq):
+    """
+    Convert discount factors into discount rates.
+
+    Inverse of rate_to_factor for the same ttm and compounding_freq.
+    """
+    func = _FACTOR_TO_RATE.get(compounding_freq)
+    if func is None:
+        func = _specialize(_FACTOR_TO_RATE, factor_to_rate_discrete,
+                           compounding_freq)
+    return func(discount_factor, ttm, compounding_freq)
+
+def _forward_periods(ttms):
+    """Length of each forward period t[i] -> t[i+1], NaN for the last tenor."""
+    tau = np.empty_like(ttms)
+    if ttms.size == 0:
+        return tau
+    np.subtract(ttms[..., 1:], ttms[..., :-1], out=tau[..., :-1])
+    tau[..., -1] = np.nan
+    return tau
+
+def _assemble(ttms, dr_, df_, ff_, fr_):
+    """
+    Wrap the converter's result buffers in a DataFrame without copying. Every
+    buffer must be owned by the converter, never a caller's array.
+    """
+    columns = {'TTM': ttms, 'DR': dr_, 'DF': df_, 'FF': ff_, 'FR': fr_}
+    if ttms.ndim == 1:
+        return pd.DataFrame(columns, copy=False)
+    n_curves, n_tenors = ttms.shape
+    index = pd.MultiIndex.from_product([range(n_curves), range(n_tenors)],
+                                       names=['curve', 'tenor'])
+    return pd.DataFrame({k: v.ravel() for k, v in columns.items()},
+                        index=index, copy=False)
+
+# Each handler returns (DR, DF, log FF) for its input type. Every column is
+# derived from the log discount factor curve and the log forward factors, so
+# no input goes through an exp followed by a log or the other way round, and
+# FR is read straight off the log forward factors. tau holds the forward
+# period lengths, computed once by the converter.
+
+def _from_dr(vals, ttms, tau, dr_compounding_freq, fr_compounding_freq,
+             df_anchor):
+    log_df = _rate_to_log_factor(vals, ttms, dr_compounding_freq)
+    log_ff = factor_to_forward_log(log_df)
+    return vals, np.exp(log_df, out=log_df), log_ff
+
+def _from_df(vals, ttms, tau, dr_compounding_freq, fr_compounding_freq,
+             df_anchor):
+    log_df = np.log(vals)
+    log_ff = factor_to_forward_log(log_df)
+    return _log_factor_to_rate(log_df, ttms, dr_compounding_freq), vals, log_ff
+
+def _from_log_ff(log_ff, ttms, dr_compounding_freq, df_anchor):
+    """
+    Shared tail of the forward inputs, taking log forward factors it owns:
+    log DF[0] = log(df_anchor) and log DF[i] = log DF[i-1] + log FF[i-1]. The
+    last forward factor looks past the curve and is reset to NaN.
+    """
+    log_df = np.empty_like(log_ff)
+    if log_ff.shape[-1] != 0:
+        log_df[..., 0] = np.log(df_anchor)
+        log_df[..., 1:] = log_ff[..., :-1]
+        np.cumsum(log_df, axis=-1, out=log_df)
+        log_ff[..., -1] = np.nan
+    df_ = np.exp(log_df)
+    return _log_factor_to_rate(log_df, ttms, dr_compounding_freq), df_, log_ff
+
+def _from_ff(vals, ttms, tau, dr_compounding_freq, fr_compounding_freq,
+             df_anchor):
+    return _from_log_ff(np.log(vals), ttms, dr_compounding_freq, df_anchor)
+
+def _from_fr(vals, ttms, tau, dr_compounding_freq, fr_compounding_freq,
+             df_anchor):
+    log_ff = _rate_to_log_factor(vals, tau, fr_compounding_freq)
+    return _from_log_ff(log_ff, ttms, dr_compounding_freq, df_anchor)
+
+_HANDLERS = {'DR': _from_dr, 'DF': _from_df, 'FR': _from_fr, 'FF': _from_ff}
+_INPUTS = frozenset(_HANDLERS)
+_FORWARD_INPUTS = frozenset({'FR', 'FF'})
+
+def rate_factor_converter(input_type, input_values, input_ttms,
+                          dr_compounding_freq='continuous',
+                          fr_compounding_freq='continuous',
+                          df_anchor=None):
+    """
+    Build a full curve table from one curve representation.
+
+    input_type is one of 'DR' (discount rates), 'DF' (discount factors),
+    'FR' (forward rates) or 'FF' (forward factors). Returns a DataFrame with
+    columns TTM, DR, DF, FF and FR, where the forward quantities in row i
+    cover the period from TTM[i] to TTM[i+1] and are NaN in the last row.
+
+    Forward inputs use that same convention, so a table's own FF or FR
+    column can be passed back in; their last value is ignored. Forwards
+    alone do not fix the level of the curve, so these inputs require
+    df_anchor, the discount factor at TTM[0] (one per curve for a batch).
+    df_anchor is rejected for the other input types. FR input is
+    compounded at fr_compounding_freq.
+
+    input_values may also be a 2-D array of shape (n_curves, n_tenors) to
+    convert a batch of curves in one pass. input_ttms is then either the
+    same shape or a single row of n_tenors shared by every curve, following
+    the usual NumPy broadcasting rules. The result is indexed by a
+    (curve, tenor) MultiIndex; 1-D input keeps the plain positional index.
+    """
+    if input_type not in _INPUTS:
+        raise ValueError(
+            f"input_type must be one of {sorted(_INPUTS)}, got {input_type!r}")
+    if (input_type in _FORWARD_INPUTS) != (df_anchor is not None):
+        raise ValueError("df_anchor is required for forward inputs "
+                         f"{sorted(_FORWARD_INPUTS)} and not accepted otherwise")
+
+    # Always copy: the inputs end up as TTM/DR/DF columns of a table built
+    # with copy=False, which must not alias the caller's arrays.
+    ttms = np.array(input_ttms, dtype=np.float64, order='C')
+    vals = np.array(input_values, dtype=np.float64, order='C')
+    if vals.ndim not in (1, 2):
+        raise ValueError(f"input_values must be 1-D or 2-D, got {vals.ndim}-D")
+    if ttms.shape != vals.shape:
+        ttms = np.ascontiguousarray(np.broadcast_to(ttms, vals.shape))
+
+    tau = _forward_periods(ttms)
+    dr_, df_, log_ff = _HANDLERS[input_type](vals, ttms, tau,
+                                             dr_compounding_freq,
+                                             fr_compounding_freq, df_anchor)
+    ff_ = np.exp(log_ff)
+    fr_ = _log_factor_to_rate(log_ff, tau, fr_compounding_freq)
+
+    return _assemble(ttms, dr_, df_, ff_, fr_)
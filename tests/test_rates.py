@@ -0,0 +1,193 @@
+"""
+Module Name: Test Rates
+Description: Tests for src/rates.py, run from the repository root with
+    python -m unittest discover tests
+Date: [2026-10-15]
+"""
+
+# Imports
+import unittest
+import warnings
+from fractions import Fraction
+
+import numpy as np
+import pandas as pd
+
+from src.rates import (factor_to_forward, factor_to_forward_log,
+                       factor_to_rate, rate_factor_converter, rate_to_factor)
+
+# Tests
+
+TTMS = np.array([0.5, 1.0, 2.0, 3.5, 5.0])
+RATES = np.array([0.011, 0.014, 0.019, 0.023, 0.026])
+FREQS = ['continuous', 1, 2, 12]
+
+
+class TestNearZeroRates(unittest.TestCase):
+
+    def test_discrete_factor_matches_exact_reference(self):
+        # Forming 1 + r / cf in floating point rounds away most of r ~ 1e-8,
+        # which leaves (1 + r / cf) ** (-cf * t) tens of ulps off.
+        for r in [1e-8, 3e-9, -1e-8]:
+            for cf, t in [(1, 30), (2, 5), (12, 10), (4, 0.25)]:
+                exact = float((1 + Fraction(r) / cf) ** -int(cf * t))
+                for df in (rate_to_factor(r, float(t), cf),
+                           rate_to_factor(np.array([r]), np.array([t]), cf)[0]):
+                    self.assertLessEqual(abs(df - exact), np.spacing(exact))
+
+    def test_discrete_rate_round_trip(self):
+        for cf in [1, 2, 12]:
+            df = rate_to_factor(1e-8, 5.0, cf)
+            self.assertAlmostEqual(factor_to_rate(df, 5.0, cf) / 1e-8, 1.0,
+                                   delta=1e-7)
+
+
+class TestRateFactor(unittest.TestCase):
+
+    def test_round_trip(self):
+        for cf in FREQS:
+            df = rate_to_factor(RATES, TTMS, cf)
+            np.testing.assert_allclose(factor_to_rate(df, TTMS, cf), RATES,
+                                       rtol=1e-12)
+
+    def test_known_values(self):
+        self.assertAlmostEqual(rate_to_factor(0.05, 2.0, 2), 1.025 ** -4)
+        self.assertAlmostEqual(rate_to_factor(0.05, 2.0, 'continuous'),
+                               np.exp(-0.1))
+
+    def test_scalar_matches_array(self):
+        cases = [(rate_to_factor, 0.05, 2.0, 2),
+                 (rate_to_factor, -1000.0, 1.0, 'continuous'),
+                 (rate_to_factor, -3.0, 1.0, 2),
+                 (factor_to_rate, 1.0, 0.0, 'continuous'),
+                 (factor_to_rate, 0.0, 1.0, 2),
+                 (factor_to_rate, -1.0, 1.0, 2)]
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            for func, x, t, cf in cases:
+                scalar = func(x, t, cf)
+                array = func(np.array([x]), np.array([t]), cf)[0]
+                np.testing.assert_array_equal(scalar, array)
+
+    def test_float32_inputs_are_computed_in_float64(self):
+        # Reference: the same float32 value, converted in float64.
+        expected = factor_to_rate(float(np.float32(0.9)), 2.0, 2)
+        for df in (np.float32(0.9), np.array(0.9, dtype=np.float32)):
+            rate = factor_to_rate(df, np.float32(2.0), 2)
+            self.assertEqual(np.asarray(rate).dtype, np.float64)
+            self.assertAlmostEqual(rate, expected, delta=1e-16)
+        factor = rate_to_factor(np.array(0.05, dtype=np.float32),
+                                np.float32(2.0), 'continuous')
+        self.assertEqual(np.asarray(factor).dtype, np.float64)
+        self.assertEqual(factor, rate_to_factor(float(np.float32(0.05)), 2.0,
+                                                'continuous'))
+
+    def test_large_arrays_match_small(self):
+        rates = np.linspace(-0.01, 0.08, 50_000)
+        for cf in FREQS:
+            whole = rate_to_factor(rates, 3.0, cf)
+            pieces = np.concatenate([rate_to_factor(rates[i:i + 100], 3.0, cf)
+                                     for i in range(0, rates.size, 100)])
+            np.testing.assert_allclose(whole, pieces, rtol=1e-15)
+            np.testing.assert_allclose(factor_to_rate(whole, 3.0, cf), rates,
+                                       rtol=1e-9, atol=1e-15)
+
+    def test_rejects_unknown_compounding_freq(self):
+        for cf in ['annual', 'Continuous', 0, -2]:
+            with self.assertRaises(ValueError):
+                rate_to_factor(0.05, 1.0, cf)
+            with self.assertRaises(ValueError):
+                factor_to_rate(0.95, 1.0, cf)
+
+
+class TestForwardFactors(unittest.TestCase):
+
+    def test_ratio_and_log_agree(self):
+        df = rate_to_factor(RATES, TTMS, 'continuous')
+        fwd = factor_to_forward(df)
+        np.testing.assert_allclose(fwd[:-1], df[1:] / df[:-1])
+        self.assertTrue(np.isnan(fwd[-1]))
+        np.testing.assert_allclose(np.exp(factor_to_forward_log(np.log(df))),
+                                   fwd)
+        self.assertEqual(fwd.dtype, np.float64)
+
+
+class TestRateFactorConverter(unittest.TestCase):
+
+    def test_columns(self):
+        table = rate_factor_converter('DR', RATES, TTMS, 2, 4)
+        self.assertEqual(list(table.columns), ['TTM', 'DR', 'DF', 'FF', 'FR'])
+        df = rate_to_factor(RATES, TTMS, 2)
+        np.testing.assert_allclose(table['DF'], df)
+        np.testing.assert_allclose(table['FF'], factor_to_forward(df))
+        np.testing.assert_allclose(
+            table['FR'][:-1], factor_to_rate(df[1:] / df[:-1], np.diff(TTMS), 4))
+
+    def test_round_trips(self):
+        # Every column of a table, fed back in, rebuilds the same table.
+        for dr_cf in FREQS:
+            for fr_cf in FREQS:
+                table = rate_factor_converter('DR', RATES, TTMS, dr_cf, fr_cf)
+                anchor = table['DF'][0]
+                for input_type in ['DR', 'DF', 'FF', 'FR']:
+                    kwargs = ({'df_anchor': anchor}
+                              if input_type in ('FF', 'FR') else {})
+                    pd.testing.assert_frame_equal(
+                        rate_factor_converter(input_type, table[input_type],
+                                              table['TTM'], dr_cf, fr_cf,
+                                              **kwargs),
+                        table, rtol=1e-10)
+
+    def test_batch_forward_round_trip(self):
+        curves = np.vstack([RATES, RATES + 0.01])
+        table = rate_factor_converter('DR', curves, TTMS, 2, 4)
+        anchors = table['DF'].xs(0, level='tenor').to_numpy()
+        for input_type in ['FF', 'FR']:
+            values = table[input_type].to_numpy().reshape(curves.shape)
+            pd.testing.assert_frame_equal(
+                rate_factor_converter(input_type, values, TTMS, 2, 4,
+                                      df_anchor=anchors),
+                table, rtol=1e-10)
+
+    def test_df_anchor_only_for_forward_inputs(self):
+        with self.assertRaises(ValueError):
+            rate_factor_converter('FF', RATES, TTMS)
+        with self.assertRaises(ValueError):
+            rate_factor_converter('DR', RATES, TTMS, df_anchor=1.0)
+
+    def test_empty_curve(self):
+        for input_type in ['DR', 'DF', 'FF', 'FR']:
+            kwargs = ({'df_anchor': 1.0}
+                      if input_type in ('FF', 'FR') else {})
+            table = rate_factor_converter(input_type, [], [], **kwargs)
+            self.assertEqual(table.shape, (0, 5))
+
+    def test_batch_matches_single_curves(self):
+        curves = np.vstack([RATES, RATES + 0.01, RATES[::-1]])
+        batch = rate_factor_converter('DR', curves, TTMS, 2, 'continuous')
+        self.assertEqual(batch.index.names, ['curve', 'tenor'])
+        for i, curve in enumerate(curves):
+            single = rate_factor_converter('DR', curve, TTMS, 2, 'continuous')
+            np.testing.assert_allclose(batch.xs(i).to_numpy(),
+                                       single.to_numpy())
+
+    def test_does_not_alias_inputs(self):
+        rates, ttms = RATES.copy(), TTMS.copy()
+        table = rate_factor_converter('DR', rates, ttms)
+        table.loc[0, ['TTM', 'DR']] = 99.0
+        np.testing.assert_array_equal(rates, RATES)
+        np.testing.assert_array_equal(ttms, TTMS)
+
+    def test_rejects_input_that_is_not_1d_or_2d(self):
+        with self.assertRaises(ValueError):
+            rate_factor_converter('DR', 0.05, 1.0)
+        with self.assertRaises(ValueError):
+            rate_factor_converter('DR', np.zeros((2, 2, 2)), 1.0)
+
+    def test_rejects_unknown_input_type(self):
+        with self.assertRaises(ValueError):
+            rate_factor_converter('XX', RATES, TTMS)
+
+
+if __name__ == '__main__':
+    unittest.main()